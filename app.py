@@ -1,12 +1,21 @@
 import streamlit as st
-from textblob import TextBlob
-import matplotlib.pyplot as plt
+from textblob.en.sentiments import PatternAnalyzer
 import numpy as np
 import os
-import json
-import requests
-import cv2
-from deepface import DeepFace
+import io
+import orjson
+import atexit
+import hashlib
+import unicodedata
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import diskcache
+from emotion_detector import EMOTION_LABELS, load_emotion_model, preprocess_face
+# cv2 and DeepFace (which pulls in TensorFlow) are imported lazily inside the
+# emotion helpers so page loads that only use the text features stay fast.
 
 # --- DEPLOYMENT AUTHORIZATION CHECK ---
 # This section serves as a deterrent for unauthorized public deployment.
@@ -40,36 +49,155 @@ except KeyError:
     st.warning("GEMINI_API_KEY not found in environment variables. Assuming Canvas will inject it.")
     gemini_api_key = ""
 
-# --- Helper Functions ---
-
-def generate_feedback(category: str, answer: str) -> str:
-    """
-    Sends the user's answer to Google Gemini API with an embedded prompt
-    to generate comprehensive feedback.
+# --- Feedback Cache Setup ---
+# Gemini responses are cached so resubmitting the same answer returns instantly.
+# Bump FEEDBACK_PROMPT_VERSION whenever the prompt changes to invalidate old entries.
+FEEDBACK_PROMPT_VERSION = "v2"
+FEEDBACK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-interview-coach")
+FEEDBACK_MEMORY_CACHE_SIZE = 512
+FEEDBACK_DISK_CACHE_SIZE_LIMIT = 64 * 1024 * 1024 # Bytes; least recently used entries are evicted past this
+
+# --- Feedback Sections ---
+# The review is split into two smaller prompts that Gemini answers concurrently,
+# so the wait is roughly the slower section instead of one long generation.
+FEEDBACK_SECTIONS = (
     """
-    if not answer.strip():
-        return "Please provide an answer to receive feedback."
-
-    prompt = f"""
-    You are an AI Interview Coach. Your goal is to provide constructive and detailed feedback
-    on interview answers. The user has provided an answer for a question in the '{category}' category.
-
-    Please analyze the following aspects of the answer:
     1.  **Content and Relevance:** Is the answer directly addressing the question? Is it comprehensive?
     2.  **Structure and Clarity:** Is the answer well-organized, logical, and easy to understand?
     3.  **Conciseness:** Is the answer to the point without unnecessary jargon or rambling?
+    """,
+    """
     4.  **Impact and Examples:** Does the answer provide specific examples or demonstrate impact where appropriate (e.g., STAR method for behavioral questions)?
     5.  **Strengths:** What did the user do well?
     6.  **Areas for Improvement:** What could the user improve? Be specific and actionable.
     7.  **Overall Score/Rating:** Provide a simple rating (e.g., 1-5, or Poor, Fair, Good, Excellent).
+    """,
+)
+FEEDBACK_SECTION_MAX_TOKENS = 400 # Keeps the combined budget at the original 800 tokens
+# Answers shorter than this get a canned reply without calling Gemini;
+# longer than the max are truncated before being sent.
+MIN_ANSWER_CHARS = 30
+MAX_ANSWER_CHARS = 6000
+# Background threads for Gemini requests, shared by all sessions.
+GEMINI_WORKER_THREADS = 4
+# Gemini requests allowed in flight at once across all sessions, so bursts
+# don't run into Gemini's 429 rate limit; further requests wait their turn.
+GEMINI_MAX_IN_FLIGHT = 2
+
+# --- Emotion Detection Setup ---
+# Webcam captures are downscaled before face detection; the Emotion CNN only
+# sees a 48x48 crop, so a smaller frame loses nothing but detector runtime.
+MAX_IMAGE_SIDE = 640
+FACE_DETECTOR_BACKEND = "opencv" # Fastest DeepFace detector; enough for a single centered face
+# Emotion results are cached by a hash of the uploaded bytes, so re-analyzing the
+# same picture (e.g. on a Streamlit rerun) skips decoding and inference. Only exact matches hit:
+# a retake with a different expression must always be analyzed again.
+EMOTION_CACHE_SIZE = 64
+
+# --- Helper Functions ---
 
+@st.cache_resource
+def _get_gemini_client():
+    """
+    Returns a shared HTTP/2 client so the TCP/TLS connection to Gemini stays warm
+    across requests and Streamlit reruns.
+    """
+    client = httpx.Client(http2=True, timeout=httpx.Timeout(30.0, connect=5.0))
+    atexit.register(client.close)
+    return client
+
+@st.cache_resource
+def _get_io_pool():
+    """
+    Returns the shared thread pool used to run Gemini requests in the background.
+    """
+    pool = ThreadPoolExecutor(max_workers=GEMINI_WORKER_THREADS, thread_name_prefix="gemini")
+    atexit.register(pool.shutdown, wait=False)
+    return pool
+
+@st.cache_resource
+def _get_gemini_slots():
+    """
+    Returns the semaphore bounding Gemini requests in flight to GEMINI_MAX_IN_FLIGHT.
+    """
+    return threading.BoundedSemaphore(GEMINI_MAX_IN_FLIGHT)
+
+@st.cache_resource
+def _get_feedback_caches():
+    """
+    Returns the in-memory LRU, the on-disk feedback cache and the lock guarding the LRU.
+    Cached as a resource so they survive Streamlit reruns; the LRU is shared by all
+    sessions, so it is only touched while holding the lock.
+    """
+    disk_cache = diskcache.Cache(
+        FEEDBACK_CACHE_DIR,
+        eviction_policy="least-recently-used",
+        size_limit=FEEDBACK_DISK_CACHE_SIZE_LIMIT
+    )
+    return OrderedDict(), disk_cache, threading.Lock()
+
+def _feedback_cache_key(category: str, answer: str) -> str:
+    """
+    Hashes the category, prompt version and normalized answer into a cache key.
+    """
+    normalized_answer = unicodedata.normalize("NFKC", answer).strip()
+    key_source = f"{category}|{FEEDBACK_PROMPT_VERSION}|{normalized_answer}"
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+def _get_cached_feedback(key: str):
+    """
+    Looks up feedback in memory first, then on disk. Returns None on a miss.
+    """
+    memory_cache, disk_cache, memory_lock = _get_feedback_caches()
+    with memory_lock:
+        if key in memory_cache:
+            memory_cache.move_to_end(key)
+            return memory_cache[key]
+
+    feedback = disk_cache.get(key)
+    if feedback is not None:
+        _store_feedback(key, feedback, persist=False)
+    return feedback
+
+def _store_feedback(key: str, feedback: str, persist: bool = True):
+    """
+    Stores feedback in the in-memory LRU and, unless persist is False, on disk.
+    """
+    memory_cache, disk_cache, memory_lock = _get_feedback_caches()
+    with memory_lock:
+        memory_cache[key] = feedback
+        memory_cache.move_to_end(key)
+        while len(memory_cache) > FEEDBACK_MEMORY_CACHE_SIZE:
+            memory_cache.popitem(last=False)
+    if persist:
+        disk_cache.set(key, feedback)
+
+def _build_feedback_prompt(category: str, answer: str, aspects: str) -> str:
+    """
+    Builds the Gemini prompt asking for feedback on one section's aspects.
+    """
+    return f"""
+    You are an AI Interview Coach. Your goal is to provide constructive and detailed feedback
+    on interview answers. The user has provided an answer for a question in the '{category}' category.
+
+    Please analyze only the following aspects of the answer:
+    {aspects}
     Interview Category: {category}
     User's Answer: "{answer}"
 
     Please provide your feedback in a clear, markdown-formatted response.
+    Start directly with the first aspect, without any introduction or closing remarks.
     """
 
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={gemini_api_key}"
+def _stream_gemini(client: httpx.Client, slots: threading.BoundedSemaphore, prompt: str, max_output_tokens: int):
+    """
+    Streams one prompt through Gemini's streamGenerateContent endpoint on client, yielding text chunks.
+    Holds a slot from slots while the request is open.
+    Raises httpx.HTTPError or orjson.JSONDecodeError on failure, and ValueError
+    if the stream contained no text.
+    """
+    # alt=sse makes Gemini send each partial response as a server-sent event
+    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent?alt=sse&key={gemini_api_key}"
 
     chatHistory = []
     chatHistory.append({"role": "user", "parts": [{"text": prompt}]})
@@ -77,83 +205,303 @@ def generate_feedback(category: str, answer: str) -> str:
     payload = {
         "contents": chatHistory,
         "generationConfig": {
-            "maxOutputTokens": 800,
+            "maxOutputTokens": max_output_tokens,
             "temperature": 0.7,
         }
     }
 
+    received_text = False
+    result = None
+    # orjson serializes the prompt natively and returns bytes ready to send
     headers = {'Content-Type': 'application/json'}
-
-    try:
-        with st.spinner("Generating feedback with AI (Gemini)..."):
-            response = requests.post(api_url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()
-            result = response.json()
-
+    with slots, client.stream("POST", api_url, content=orjson.dumps(payload), headers=headers) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith("data:"):
+                continue
+            result = orjson.loads(line[len("data:"):])
+
+            # Chunks without text (e.g. the final finishReason chunk) are skipped
             if result.get("candidates") and len(result["candidates"]) > 0 and \
                result["candidates"][0].get("content") and result["candidates"][0]["content"].get("parts") and \
                len(result["candidates"][0]["content"]["parts"]) > 0:
-                feedback = result["candidates"][0]["content"]["parts"][0]["text"]
-                return feedback
-            else:
-                st.error(f"Gemini API response structure unexpected: {result}")
-                return "An error occurred while parsing Gemini feedback. Please try again."
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"Gemini API Request Error: {e}")
-        return "An error occurred while connecting to Gemini API. Please check your network or API key."
-    except json.JSONDecodeError as e:
-        st.error(f"Failed to decode JSON response from Gemini API: {e}")
-        return "An error occurred while processing Gemini feedback. Please try again."
+                text = result["candidates"][0]["content"]["parts"][0].get("text", "")
+                if text:
+                    received_text = True
+                    yield text
+
+    if not received_text:
+        raise ValueError(f"Gemini API response structure unexpected: {result}")
+
+def _collect_gemini(client: httpx.Client, slots: threading.BoundedSemaphore, prompt: str, max_output_tokens: int) -> str:
+    """
+    Runs _stream_gemini to completion and returns the full text.
+    """
+    return "".join(_stream_gemini(client, slots, prompt, max_output_tokens))
+
+def _stream_in_background(pool: ThreadPoolExecutor, client: httpx.Client, slots: threading.BoundedSemaphore,
+                          prompt: str, max_output_tokens: int):
+    """
+    Starts streaming a prompt on pool and returns a generator
+    that yields its text chunks as they arrive, re-raising any worker error.
+    """
+    chunks = queue.Queue()
+    done = object()
+
+    def produce():
+        try:
+            for text in _stream_gemini(client, slots, prompt, max_output_tokens):
+                chunks.put(text)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(done)
+
+    pool.submit(produce)
+
+    def consume():
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    return consume()
+
+def _start_feedback(category: str, answer: str, use_cache: bool = True, errors: list = None):
+    """
+    Checks the user's answer and starts generating feedback with Google Gemini API
+    in the background. Returns a generator of markdown text chunks for st.write_stream;
+    the first section streams live while the remaining sections are generated
+    concurrently on the shared thread pool.
+    Identical answers are served from the feedback cache unless use_cache is False.
+    If errors is given, a message is appended to it when generation fails.
+    """
+    answer = answer.strip()
+    if not answer:
+        return iter(["Please provide an answer to receive feedback."])
+    if len(answer) < MIN_ANSWER_CHARS:
+        return iter(["Your answer is too short for meaningful feedback — aim for 3–5 sentences."])
+    if len(answer) > MAX_ANSWER_CHARS:
+        st.info(f"Your answer is longer than {MAX_ANSWER_CHARS} characters, "
+                f"so only the first {MAX_ANSWER_CHARS} were sent for feedback.")
+        answer = answer[:MAX_ANSWER_CHARS] + " …[truncated]"
+
+    cache_key = _feedback_cache_key(category, answer)
+    if use_cache:
+        cached_feedback = _get_cached_feedback(cache_key)
+        if cached_feedback is not None:
+            return iter([cached_feedback])
+
+    # Shared resources are looked up here, on the script thread: st.cache_resource
+    # needs the script run context, which the pool's worker threads don't have
+    client = _get_gemini_client()
+    pool = _get_io_pool()
+    slots = _get_gemini_slots()
+
+    prompts = [_build_feedback_prompt(category, answer, aspects) for aspects in FEEDBACK_SECTIONS]
+    first_section = _stream_in_background(pool, client, slots, prompts[0], FEEDBACK_SECTION_MAX_TOKENS)
+    remaining_sections = [
+        pool.submit(_collect_gemini, client, slots, prompt, FEEDBACK_SECTION_MAX_TOKENS) for prompt in prompts[1:]
+    ]
+    return _stream_feedback(first_section, remaining_sections, cache_key if use_cache else None, errors)
+
+def _stream_feedback(first_section, remaining_sections, cache_key, errors=None):
+    """
+    Yields the first section's chunks as they arrive, then each remaining section.
+    Errors are reported here, on the Streamlit script thread, and recorded in errors
+    when it is given. The combined feedback is cached under cache_key unless it is None.
+    """
+    if errors is None:
+        errors = []
+    feedback_parts = []
+    try:
+        for text in first_section:
+            feedback_parts.append(text)
+            yield text
+
+        for future in remaining_sections:
+            text = "\n\n" + future.result()
+            feedback_parts.append(text)
+            yield text
+
+        if cache_key is not None:
+            _store_feedback(cache_key, "".join(feedback_parts))
+
+    except httpx.HTTPError as e:
+        errors.append(f"Gemini API Request Error: {e}")
+        st.error(errors[-1])
+        yield "An error occurred while connecting to Gemini API. Please check your network or API key."
+    except orjson.JSONDecodeError as e:
+        errors.append(f"Failed to decode JSON response from Gemini API: {e}")
+        st.error(errors[-1])
+        yield "An error occurred while processing Gemini feedback. Please try again."
+    except ValueError as e:
+        errors.append(str(e))
+        st.error(errors[-1])
+        yield "An error occurred while parsing Gemini feedback. Please try again."
     except Exception as e:
-        st.error(f"An unexpected error occurred: {e}")
-        return "An unexpected error occurred. Please try again."
+        errors.append(f"An unexpected error occurred: {e}")
+        st.error(errors[-1])
+        yield "An unexpected error occurred. Please try again."
+    finally:
+        for future in remaining_sections:
+            future.cancel()
+
+@st.cache_resource(show_spinner=False)
+def _get_sentiment_analyzer():
+    """
+    Returns a shared TextBlob PatternAnalyzer (TextBlob's default sentiment analyzer),
+    so each call skips building a TextBlob object around the text.
+    The analyzer is warmed up once, since its sentiment lexicon loads lazily on first use.
+    """
+    analyzer = PatternAnalyzer()
+    analyzer.analyze("warm up")
+    return analyzer
+
+# Load the sentiment lexicon when the page first loads rather than on the first "Get Feedback"
+_get_sentiment_analyzer()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _analyze_sentiment_cached(text: str) -> tuple:
+    """
+    Memoized (polarity, subjectivity) for already-stripped text.
+    """
+    sentiment = _get_sentiment_analyzer().analyze(text)
+    return sentiment.polarity, sentiment.subjectivity
 
 def analyze_sentiment(text: str):
     """
     Performs sentiment analysis on the given text using TextBlob.
     Returns polarity (-1.0 to 1.0) and subjectivity (0.0 to 1.0).
     """
-    if not text.strip():
+    text = text.strip()
+    if not text:
         return {"polarity": 0.0, "subjectivity": 0.0}
 
-    analysis = TextBlob(text)
+    polarity, subjectivity = _analyze_sentiment_cached(text)
     return {
-        "polarity": analysis.sentiment.polarity,
-        "subjectivity": analysis.sentiment.subjectivity
+        "polarity": polarity,
+        "subjectivity": subjectivity
     }
 
+def _sentiment_chart_spec(title: str, label: str, value: float, domain: list, color: str) -> dict:
+    """
+    Builds a single-bar Vega-Lite spec with a fixed y-axis range and a value label.
+    The browser renders it natively, so no figure is rasterized on the server.
+    """
+    encoding = {
+        "x": {"field": "metric", "type": "nominal", "axis": {"title": None, "labelAngle": 0}},
+        "y": {"field": "value", "type": "quantitative", "scale": {"domain": domain}, "axis": {"title": None}},
+    }
+    return {
+        "title": title,
+        "height": 300,
+        "data": {"values": [{"metric": label, "value": value}]},
+        "layer": [
+            {"mark": {"type": "bar", "color": color}, "encoding": encoding},
+            {
+                "mark": {"type": "text", "dy": -8 if value >= 0 else 8},
+                "encoding": {**encoding, "text": {"field": "value", "type": "quantitative", "format": ".2f"}},
+            },
+            {"mark": {"type": "rule", "color": "grey", "strokeWidth": 0.8}, "encoding": {"y": {"datum": 0}}},
+        ],
+    }
+
+@st.cache_resource
+def _get_emotion_model():
+    """
+    Loads the Emotion model once per Streamlit process: the INT8 TFLite export
+    when available, otherwise DeepFace's Keras model.
+    """
+    return load_emotion_model()
+
+@st.cache_resource
+def _get_emotion_cache():
+    """
+    Returns the image hash -> (dominant emotion, scores) LRU shared across reruns,
+    together with the lock guarding it, since all sessions use the same cache.
+    """
+    return OrderedDict(), threading.Lock()
+
+def _get_cached_emotion(image_hash: str):
+    """
+    Returns the cached result for image_hash, or None on a miss.
+    """
+    emotion_cache, cache_lock = _get_emotion_cache()
+    with cache_lock:
+        if image_hash in emotion_cache:
+            emotion_cache.move_to_end(image_hash)
+            return emotion_cache[image_hash]
+    return None
+
+def _store_emotion(image_hash: str, result):
+    """
+    Stores an emotion result, evicting the least recently used entries past EMOTION_CACHE_SIZE.
+    """
+    emotion_cache, cache_lock = _get_emotion_cache()
+    with cache_lock:
+        emotion_cache[image_hash] = result
+        emotion_cache.move_to_end(image_hash)
+        while len(emotion_cache) > EMOTION_CACHE_SIZE:
+            emotion_cache.popitem(last=False)
+
 def analyze_emotion_from_image(image_bytes):
     """
     Analyzes facial emotion from a single image using DeepFace.
+    Faces are detected with DeepFace and classified by calling the preloaded
+    Emotion model directly, skipping DeepFace.analyze's per-call dispatch.
+    Pictures analyzed before are answered from the cache before being decoded.
     Returns dominant emotion and emotion scores.
     """
     if image_bytes is None:
         return None, "No image provided."
 
-    try:
-        # Convert image bytes to numpy array
-        np_array = np.frombuffer(image_bytes, np.uint8)
-        # Decode image using OpenCV
-        img = cv2.imdecode(np_array, cv2.IMREAD_COLOR)
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    cached_result = _get_cached_emotion(image_hash)
+    if cached_result is not None:
+        return cached_result
 
-        if img is None:
+    import cv2
+    from PIL import Image
+    from deepface import DeepFace
+
+    try:
+        # Decode the capture with Pillow straight from the bytes. For JPEGs, thumbnail()
+        # has libjpeg decode at a reduced DCT scale before shrinking the long side to
+        # MAX_IMAGE_SIDE, so any face coordinates DeepFace reports are in this resized space.
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+            rgb_img = np.asarray(image.convert("RGB"))
+        except OSError:
             return None, "Could not decode image. Please try another picture."
 
+        # DeepFace expects BGR; cvtColor also returns the C-contiguous array OpenCV needs
+        img = cv2.cvtColor(rgb_img, cv2.COLOR_RGB2BGR)
+
         # Analyze emotions using DeepFace
         with st.spinner("Analyzing facial emotions..."):
-            demographies = DeepFace.analyze(
+            faces = DeepFace.extract_faces(
                 img_path=img,
-                actions=['emotion'],
+                detector_backend=FACE_DETECTOR_BACKEND,
                 enforce_detection=False
             )
 
-        if demographies:
-            dominant_emotion = demographies[0]['dominant_emotion']
-            emotion_scores = demographies[0]['emotion']
-            return dominant_emotion, emotion_scores
-        else:
-            return None, "No face detected in the image."
+            if not faces:
+                return None, "No face detected in the image."
+
+            # The Emotion model expects a batch, so add a leading axis for the single face
+            face_batch = np.expand_dims(preprocess_face(faces[0]["face"]), axis=0)
+            predictions = _get_emotion_model().predict(face_batch, verbose=0)[0]
+
+        # Pick the dominant emotion straight from the probability vector
+        dominant_emotion = EMOTION_LABELS[int(np.argmax(predictions))]
+        emotion_scores = dict(zip(EMOTION_LABELS, (predictions * 100).tolist()))
+        _store_emotion(image_hash, (dominant_emotion, emotion_scores))
+        return dominant_emotion, emotion_scores
 
     except Exception as e:
         st.error(f"Error analyzing image for emotions: {e}")
@@ -190,15 +538,24 @@ user_answer = st.text_area(
     placeholder=f"e.g., 'Tell me about yourself.' (for {question_category} category)"
 )
 
+use_cached_feedback = st.checkbox(
+    "Reuse saved feedback for identical answers",
+    value=True,
+    help="Uncheck to always request fresh feedback from Gemini."
+)
+
 # --- Submit Button ---
 if st.button("Get Feedback", type="primary"):
     if not user_answer.strip():
         st.warning("Please enter your answer before getting feedback.")
     else:
         st.header("3. Feedback Report")
-        ai_feedback = generate_feedback(question_category, user_answer)
-        st.subheader("🤖 AI-Powered Feedback")
-        st.markdown(ai_feedback)
+        # Start Gemini in the background first so it overlaps with the sentiment
+        # analysis below; the feedback is rendered into this container afterwards.
+        feedback_errors = []
+        feedback_stream = _start_feedback(question_category, user_answer, use_cache=use_cached_feedback,
+                                          errors=feedback_errors)
+        feedback_container = st.container()
 
         st.markdown("---")
 
@@ -210,22 +567,26 @@ if st.button("Get Feedback", type="primary"):
         st.write(f"**Polarity (Emotion):** {polarity:.2f} (closer to 1.0 is positive, -1.0 is negative)")
         st.write(f"**Subjectivity (Opinion):** {subjectivity:.2f} (closer to 1.0 is opinion, 0.0 is factual)")
 
-        fig, ax = plt.subplots(1, 2, figsize=(10, 4))
-
-        ax[0].bar(['Polarity'], [polarity], color=['skyblue' if polarity >= 0 else 'salmon'])
-        ax[0].set_ylim([-1, 1])
-        ax[0].set_title('Sentiment Polarity')
-        ax[0].axhline(0, color='grey', linewidth=0.8)
-        ax[0].text(0, polarity, f'{polarity:.2f}', ha='center', va='bottom' if polarity >= 0 else 'top')
-
-        ax[1].bar(['Subjectivity'], [subjectivity], color=['lightgreen'])
-        ax[1].set_ylim([0, 1])
-        ax[1].set_title('Sentiment Subjectivity')
-        ax[1].text(0, subjectivity, f'{subjectivity:.2f}', ha='center', va='bottom')
-
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+        polarity_col, subjectivity_col = st.columns(2)
+        polarity_col.vega_lite_chart(
+            spec=_sentiment_chart_spec('Sentiment Polarity', 'Polarity', polarity, [-1, 1],
+                                       'skyblue' if polarity >= 0 else 'salmon'),
+            use_container_width=True
+        )
+        subjectivity_col.vega_lite_chart(
+            spec=_sentiment_chart_spec('Sentiment Subjectivity', 'Subjectivity', subjectivity, [0, 1], 'lightgreen'),
+            use_container_width=True
+        )
+
+        with feedback_container:
+            st.subheader("🤖 AI-Powered Feedback")
+            with st.status("Generating feedback with AI (Gemini)...", expanded=True) as feedback_status:
+                # Render Gemini's response token-by-token instead of waiting for the full reply
+                st.write_stream(feedback_stream)
+                if feedback_errors:
+                    feedback_status.update(label="AI feedback failed", state="error")
+                else:
+                    feedback_status.update(label="AI feedback ready", state="complete")
 
         st.markdown("---")
 
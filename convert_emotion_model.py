@@ -0,0 +1,64 @@
+import argparse
+import glob
+import os
+import numpy as np
+from emotion_detector import EMOTION_TFLITE_PATH, preprocess_face
+
+# --- Offline INT8 export of DeepFace's Emotion model ---
+# Post-training quantization needs sample faces to calibrate activation ranges.
+# Point this script at a folder of face photos (e.g. webcam selfies or FER-2013 images);
+# the resulting emotion_int8.tflite is picked up automatically by app.py and emotion_detector.py.
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+def representative_faces(image_dir, limit):
+    """
+    Yields preprocessed 48x48x1 faces detected in the images under image_dir.
+    """
+    import cv2
+    from deepface import DeepFace
+
+    image_paths = sorted(
+        path for pattern in IMAGE_PATTERNS
+        for path in glob.glob(os.path.join(image_dir, "**", pattern), recursive=True)
+    )
+
+    for path in image_paths[:limit]:
+        img = cv2.imread(path)
+        if img is None:
+            continue
+        faces = DeepFace.extract_faces(img_path=img, detector_backend="opencv", enforce_detection=False)
+        if faces:
+            yield preprocess_face(faces[0]["face"])
+
+def convert_emotion_model(image_dir, output_path=EMOTION_TFLITE_PATH, limit=300):
+    """
+    Converts DeepFace's Keras Emotion model to a fully INT8-quantized TFLite model.
+    """
+    import tensorflow as tf
+    from deepface import DeepFace
+
+    model = DeepFace.build_model(task="facial_attribute", model_name="Emotion").model
+
+    def representative_dataset():
+        for face in representative_faces(image_dir, limit):
+            yield [np.expand_dims(face, axis=0)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    print(f"Saved INT8 Emotion model to {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export DeepFace's Emotion model to INT8 TFLite.")
+    parser.add_argument("image_dir", help="Folder of face images used to calibrate quantization.")
+    parser.add_argument("--output", default=EMOTION_TFLITE_PATH, help="Where to write the .tflite file.")
+    parser.add_argument("--limit", type=int, default=300, help="Maximum number of calibration images.")
+    args = parser.parse_args()
+    convert_emotion_model(args.image_dir, args.output, args.limit)
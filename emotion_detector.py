@@ -1,11 +1,170 @@
-import cv2
 import numpy as np
-from deepface import DeepFace # DeepFace is a powerful library for facial analysis
 import os
+import threading
 
 # --- Configuration for DeepFace (optional, for model paths etc.) ---
 # DeepFace models might download on first use.
 # You can specify model paths if you want to manage them manually.
+# cv2, Streamlit and DeepFace (which pulls in TensorFlow) are imported inside the
+# functions so importing this module stays cheap.
+
+# Output order of DeepFace's Emotion CNN
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+EMOTION_INPUT_SIZE = 48 # The Emotion CNN takes 48x48 grayscale faces
+EMOTION_BATCH_SIZE = 8 # Sampled faces buffered per Emotion CNN call
+# INT8 TFLite export of the Emotion CNN, created by convert_emotion_model.py.
+# When present it is used instead of DeepFace's FP32 Keras model.
+EMOTION_TFLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "emotion_int8.tflite")
+
+def preprocess_face(face):
+    """
+    Converts a face returned by DeepFace.extract_faces (RGB, values in [0, 1])
+    into the 48x48x1 grayscale array the Emotion CNN expects.
+    """
+    import cv2
+
+    gray = cv2.cvtColor(face.astype(np.float32), cv2.COLOR_RGB2GRAY)
+
+    # Pad to a square first so resizing keeps the face's aspect ratio
+    height, width = gray.shape
+    side = max(height, width)
+    padded = np.zeros((side, side), dtype=np.float32)
+    top, left = (side - height) // 2, (side - width) // 2
+    padded[top:top + height, left:left + width] = gray
+
+    resized = cv2.resize(padded, (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE), interpolation=cv2.INTER_AREA)
+    return resized[:, :, np.newaxis]
+
+class TFLiteEmotionModel:
+    """
+    Runs the INT8 TFLite Emotion model behind the same predict() call as the Keras model.
+    """
+
+    def __init__(self, model_path):
+        import tensorflow as tf
+
+        self.interpreter = tf.lite.Interpreter(model_path=model_path)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+        self._lock = threading.Lock() # The interpreter is not safe to share across threads
+
+    def predict(self, batch, batch_size=None, verbose=0):
+        """
+        Returns (N, 7) emotion probabilities for a (N, 48, 48, 1) float batch in [0, 1].
+        """
+        # The interpreter and its tensor details are only touched under the lock,
+        # since a resize on another thread replaces them
+        with self._lock:
+            input_details = self.input_details
+            input_scale, input_zero_point = input_details["quantization"]
+            if input_scale:
+                batch = np.round(batch / input_scale + input_zero_point)
+                # Pixels outside the calibrated range must saturate rather than wrap around
+                dtype_info = np.iinfo(input_details["dtype"])
+                batch = np.clip(batch, dtype_info.min, dtype_info.max)
+            batch = batch.astype(input_details["dtype"])
+
+            if tuple(input_details["shape"]) != batch.shape:
+                self.interpreter.resize_tensor_input(input_details["index"], batch.shape)
+                self.interpreter.allocate_tensors()
+                self.input_details = self.interpreter.get_input_details()[0]
+                self.output_details = self.interpreter.get_output_details()[0]
+            self.interpreter.set_tensor(self.input_details["index"], batch)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output_details["index"])
+            output_scale, output_zero_point = self.output_details["quantization"]
+
+        if output_scale:
+            output = (output.astype(np.float32) - output_zero_point) * output_scale
+        return output
+
+def load_emotion_model():
+    """
+    Returns the INT8 TFLite Emotion model if it has been exported,
+    otherwise DeepFace's Keras Emotion model.
+    """
+    if os.path.exists(EMOTION_TFLITE_PATH):
+        return TFLiteEmotionModel(EMOTION_TFLITE_PATH)
+
+    from deepface import DeepFace
+    return DeepFace.build_model(task="facial_attribute", model_name="Emotion").model
+
+class LatestFrameReader:
+    """
+    Reads webcam frames on a background thread and keeps only the newest one,
+    so slow emotion analysis never works through a backlog of stale frames.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self._condition = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._ok = True
+        self._error = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        # This thread owns the capture: it is released here, after the last read,
+        # because OpenCV does not support releasing it while a read is in progress
+        try:
+            while True:
+                ret, frame = self.cap.read()
+                with self._condition:
+                    if self._stopped:
+                        return
+                    self._ok = ret
+                    if ret:
+                        self._frame = frame
+                        self._frame_id += 1
+                    self._condition.notify_all()
+                if not ret:
+                    return
+        except Exception as e:
+            # Handed to read() so the caller sees the camera failure instead of waiting forever
+            self._error = e
+        finally:
+            with self._condition:
+                self._ok = False
+                self._condition.notify_all()
+            self.cap.release()
+
+    def read(self, last_frame_id):
+        """
+        Waits for a frame newer than last_frame_id.
+        Returns (ret, frame, frame_id); ret is False once the camera stops delivering frames.
+        Re-raises the exception if reading from the camera failed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._frame_id > last_frame_id or not self._ok)
+            if self._frame_id <= last_frame_id:
+                if self._error is not None:
+                    raise self._error
+                return False, None, last_frame_id
+            return True, self._frame, self._frame_id
+
+    def stop(self):
+        """
+        Asks the reader thread to finish; it releases the capture once its current read returns.
+        """
+        with self._condition:
+            self._stopped = True
+        self._thread.join(timeout=1.0)
+
+def predict_emotion_batch(emotion_model, faces):
+    """
+    Runs the Emotion CNN once over a list of preprocessed faces.
+    Returns the dominant emotion's index into EMOTION_LABELS for each face, in order.
+    """
+    batch = np.stack(faces) # (N, 48, 48, 1)
+    predictions = emotion_model.predict(batch, batch_size=len(faces), verbose=0)
+    return np.argmax(predictions, axis=1)
 
 def analyze_facial_emotion_from_webcam():
     """
@@ -23,64 +182,101 @@ def analyze_facial_emotion_from_webcam():
     - Building a dedicated client-side (JavaScript) component to handle webcam.
     - Running the Streamlit app locally.
     """
+    import cv2
+    import streamlit as st
+    from deepface import DeepFace # DeepFace is a powerful library for facial analysis
+
+    # Load the Emotion model before opening the webcam, so a slow build or a failed
+    # weight download neither keeps the camera busy nor leaves it open
+    emotion_model = load_emotion_model()
+
     cap = cv2.VideoCapture(0) # 0 for default webcam
 
     if not cap.isOpened():
         print("Error: Could not open webcam.")
         return "Webcam not accessible."
 
+    # Keep the driver queue to a single frame and read it on a background thread,
+    # so each loop iteration analyzes the freshest frame instead of a queued one
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FPS, 15)
+
     st.write("Starting webcam feed... (Check your browser for permission prompt)")
     st.write("Press 'q' to quit the webcam feed.")
 
-    emotion_history = []
+    # Running count per emotion class (indexed like EMOTION_LABELS), so the
+    # session summary needs constant memory however long the feed runs
+    emotion_counts = np.zeros(len(EMOTION_LABELS), dtype=np.int64)
     frame_count = 0
     processing_interval = 5 # Analyze every 5th frame to reduce load
 
+    # Sampled faces are buffered and classified EMOTION_BATCH_SIZE at a time
+    # instead of running DeepFace per frame. Every face in a sampled frame joins
+    # the batch, so several people in view still cost a single predict call.
+    pending_faces = []
+    pending_boxes = []
+    pending_frames = [] # Sampled frame number each pending face came from
+    last_annotations = [] # (face box, emotion) pairs drawn on the feed
+
+    frame_reader = LatestFrameReader(cap).start()
+    frame_id = 0
+
     try:
         while True:
-            ret, frame = cap.read()
+            ret, frame, frame_id = frame_reader.read(frame_id)
             if not ret:
                 print("Error: Could not read frame.")
                 break
 
             frame_count += 1
             if frame_count % processing_interval == 0:
-                # Convert frame to RGB (DeepFace expects RGB)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
                 try:
-                    # Analyze emotions in the frame
-                    # actions=['emotion'] tells DeepFace to only focus on emotion
-                    demographies = DeepFace.analyze(
-                        img_path=rgb_frame,
-                        actions=['emotion'],
+                    # Detect faces in the frame (DeepFace takes BGR numpy arrays as-is)
+                    faces = DeepFace.extract_faces(
+                        img_path=frame,
+                        detector_backend="opencv",
                         enforce_detection=False # Set to False to avoid errors if no face is detected
                     )
 
-                    if demographies:
-                        # DeepFace returns a list of dictionaries, one for each detected face
-                        # We'll consider the first detected face for simplicity
-                        dominant_emotion = demographies[0]['dominant_emotion']
-                        emotion_scores = demographies[0]['emotion']
-                        emotion_history.append(dominant_emotion)
-
-                        # Draw bounding box and emotion on the frame
-                        x, y, w, h = demographies[0]['face_box']['x'], demographies[0]['face_box']['y'], \
-                                     demographies[0]['face_box']['w'], demographies[0]['face_box']['h']
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                        cv2.putText(frame, dominant_emotion, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-
-                        print(f"Detected emotion: {dominant_emotion}")
-                        # You would typically send this data back to Streamlit
-                        # or update a Streamlit component here.
-                        # For real-time display in Streamlit, you'd use st.image(frame, channels="BGR")
-                        # but this requires constant frame updates which is tricky.
+                    # DeepFace returns a list of dictionaries, one for each detected face.
+                    # With enforce_detection=False a frame without faces comes back as a
+                    # single whole-frame entry with zero confidence, which is skipped.
+                    for face_obj in faces:
+                        if face_obj.get("confidence", 1) == 0:
+                            continue
+                        pending_faces.append(preprocess_face(face_obj["face"]))
+                        pending_boxes.append(face_obj["facial_area"])
+                        pending_frames.append(frame_count)
 
                 except ValueError as e:
                     # This often happens if no face is detected in the frame
                     # print(f"No face detected or error during analysis: {e}")
                     pass # Silently pass if no face or minor error
 
+                if len(pending_faces) >= EMOTION_BATCH_SIZE:
+                    batch_emotion_ids = predict_emotion_batch(emotion_model, pending_faces)
+                    emotion_counts += np.bincount(batch_emotion_ids, minlength=len(EMOTION_LABELS))
+
+                    # Annotate the faces from the most recent frame in the batch
+                    last_annotations = [
+                        (box, EMOTION_LABELS[emotion_id])
+                        for box, emotion_id, frame_number in zip(pending_boxes, batch_emotion_ids, pending_frames)
+                        if frame_number == pending_frames[-1]
+                    ]
+                    pending_faces, pending_boxes, pending_frames = [], [], []
+
+                    print(f"Detected emotions: {[emotion for _, emotion in last_annotations]}")
+                    # You would typically send this data back to Streamlit
+                    # or update a Streamlit component here.
+                    # For real-time display in Streamlit, you'd use st.image(frame, channels="BGR")
+                    # but this requires constant frame updates which is tricky.
+
+            # Draw the latest bounding boxes and batch emotions on the frame
+            for face_box, emotion in last_annotations:
+                x, y, w, h = face_box['x'], face_box['y'], face_box['w'], face_box['h']
+                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                cv2.putText(frame, emotion, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+
             # Display the frame (for local testing)
             cv2.imshow('Webcam Feed - Emotion Detection (Press Q to quit)', frame)
 
@@ -89,15 +285,18 @@ def analyze_facial_emotion_from_webcam():
                 break
 
     finally:
-        cap.release()
+        frame_reader.stop() # Also releases the capture
         cv2.destroyAllWindows()
         print("Webcam feed stopped.")
 
-    if emotion_history:
+    # Classify any faces left over from a partially filled batch
+    if pending_faces:
+        batch_emotion_ids = predict_emotion_batch(emotion_model, pending_faces)
+        emotion_counts += np.bincount(batch_emotion_ids, minlength=len(EMOTION_LABELS))
+
+    if emotion_counts.any():
         # Return a summary of detected emotions
-        from collections import Counter
-        emotion_counts = Counter(emotion_history)
-        most_common_emotion = emotion_counts.most_common(1)[0][0]
+        most_common_emotion = EMOTION_LABELS[int(emotion_counts.argmax())]
         return f"Overall dominant emotion: {most_common_emotion}"
     else:
         return "No emotions detected during the session."
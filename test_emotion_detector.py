@@ -0,0 +1,176 @@
+import sys
+import threading
+import types
+import numpy as np
+import pytest
+import emotion_detector
+from emotion_detector import (
+    EMOTION_INPUT_SIZE,
+    EMOTION_LABELS,
+    LatestFrameReader,
+    TFLiteEmotionModel,
+    predict_emotion_batch,
+)
+
+# --- Fakes ---
+
+class FakeInterpreter:
+    """
+    Mimics tf.lite.Interpreter for a fully INT8 model with 7 outputs.
+    invoke() echoes the first input pixel of each face into every output slot.
+    """
+
+    def __init__(self, model_path=None):
+        self.input_shape = np.array([1, EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1])
+        self.resized_to = []
+        self.input_tensor = None
+        self.output_tensor = None
+
+    def allocate_tensors(self):
+        pass
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": self.input_shape.copy(), "dtype": np.int8,
+                 "quantization": (1 / 300, 0)}]
+
+    def get_output_details(self):
+        return [{"index": 1, "shape": np.array([self.input_shape[0], 7]), "dtype": np.int8,
+                 "quantization": (1 / 256, -128)}]
+
+    def resize_tensor_input(self, index, shape):
+        self.resized_to.append(tuple(shape))
+        self.input_shape = np.array(shape)
+
+    def set_tensor(self, index, value):
+        assert value.shape == tuple(self.input_shape)
+        self.input_tensor = value
+
+    def invoke(self):
+        first_pixels = self.input_tensor[:, 0, 0, 0]
+        self.output_tensor = np.repeat(first_pixels[:, np.newaxis], 7, axis=1).astype(np.int8)
+
+    def get_tensor(self, index):
+        return self.input_tensor if index == 0 else self.output_tensor
+
+class FakeKerasModel:
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.calls = []
+
+    def predict(self, batch, batch_size=None, verbose=0):
+        self.calls.append((batch.shape, batch_size))
+        return self.predictions
+
+class FakeCapture:
+    """
+    Delivers the given frames, then raises error if one is given,
+    otherwise reports that no more frames are available.
+    """
+
+    def __init__(self, frames, error=None):
+        self.frames = list(frames)
+        self.error = error
+        self.released = threading.Event()
+
+    def read(self):
+        if self.frames:
+            return True, self.frames.pop(0)
+        if self.error is not None:
+            raise self.error
+        return False, None
+
+    def release(self):
+        self.released.set()
+
+@pytest.fixture
+def tflite_model(monkeypatch):
+    fake_tf = types.SimpleNamespace(lite=types.SimpleNamespace(Interpreter=FakeInterpreter))
+    monkeypatch.setitem(sys.modules, "tensorflow", fake_tf)
+    return TFLiteEmotionModel("unused.tflite")
+
+def _face_batch(first_pixels):
+    batch = np.zeros((len(first_pixels), EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1), dtype=np.float32)
+    batch[:, 0, 0, 0] = first_pixels
+    return batch
+
+# --- TFLiteEmotionModel ---
+
+def test_tflite_predict_saturates_out_of_range_inputs(tflite_model):
+    # With a 1/300 input scale, 1.0 and -1.0 fall outside int8 and must clip, not wrap
+    tflite_model.predict(_face_batch([1.0, -1.0, 0.1]))
+
+    assert tflite_model.interpreter.input_tensor[:, 0, 0, 0].tolist() == [127, -128, 30]
+
+def test_tflite_predict_dequantizes_outputs(tflite_model):
+    output = tflite_model.predict(_face_batch([0.1]))
+
+    assert output.shape == (1, 7)
+    assert output.dtype == np.float32
+    np.testing.assert_allclose(output, (30 + 128) / 256)
+
+def test_tflite_predict_resizes_for_new_batch_sizes(tflite_model):
+    assert tflite_model.predict(_face_batch([0.0])).shape == (1, 7)
+    assert tflite_model.predict(_face_batch([0.0, 0.1, 0.2])).shape == (3, 7)
+    assert tflite_model.predict(_face_batch([0.0, 0.1, 0.2])).shape == (3, 7)
+    assert tflite_model.predict(_face_batch([0.0, 0.1])).shape == (2, 7)
+
+    size = EMOTION_INPUT_SIZE
+    assert tflite_model.interpreter.resized_to == [(3, size, size, 1), (2, size, size, 1)]
+
+# --- predict_emotion_batch ---
+
+def test_predict_emotion_batch_returns_argmax_per_face():
+    predictions = np.zeros((2, len(EMOTION_LABELS)), dtype=np.float32)
+    predictions[0, EMOTION_LABELS.index("happy")] = 0.9
+    predictions[1, EMOTION_LABELS.index("neutral")] = 0.8
+    model = FakeKerasModel(predictions)
+    faces = [np.zeros((EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1), dtype=np.float32)] * 2
+
+    emotion_ids = predict_emotion_batch(model, faces)
+
+    assert [EMOTION_LABELS[i] for i in emotion_ids] == ["happy", "neutral"]
+    assert model.calls == [((2, EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1), 2)]
+
+# --- preprocess_face ---
+
+def test_preprocess_face_returns_square_grayscale_input():
+    pytest.importorskip("cv2")
+    face = np.ones((60, 30, 3), dtype=np.float64)
+
+    processed = emotion_detector.preprocess_face(face)
+
+    assert processed.shape == (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1)
+    assert processed.dtype == np.float32
+    # The narrow face is padded with black on both sides to keep its aspect ratio
+    assert processed[:, 0, 0].max() == 0
+    assert processed[EMOTION_INPUT_SIZE // 2, EMOTION_INPUT_SIZE // 2, 0] == pytest.approx(1.0)
+
+# --- LatestFrameReader ---
+
+def test_frame_reader_ends_when_camera_stops():
+    cap = FakeCapture(["frame-1", "frame-2"])
+    reader = LatestFrameReader(cap).start()
+
+    frames = []
+    frame_id = 0
+    while True:
+        ret, frame, frame_id = reader.read(frame_id)
+        if not ret:
+            break
+        frames.append(frame)
+    reader.stop()
+
+    assert frames and frames[-1] == "frame-2"
+    assert cap.released.wait(timeout=1.0)
+
+def test_frame_reader_reraises_camera_errors():
+    cap = FakeCapture(["frame-1"], error=RuntimeError("camera unplugged"))
+    reader = LatestFrameReader(cap).start()
+
+    ret, frame, frame_id = reader.read(0)
+    assert ret and frame == "frame-1"
+    with pytest.raises(RuntimeError, match="camera unplugged"):
+        reader.read(frame_id)
+    reader.stop()
+
+    assert cap.released.wait(timeout=1.0)